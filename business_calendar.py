@@ -0,0 +1,243 @@
+from datetime import date, datetime
+from functools import lru_cache
+
+import numpy as np
+
+WEEKMASK = "1111100"
+
+
+class holidayCalendar(object):
+    """
+    This class is the base holiday calendar used by the business calendar functions.
+    Pass a list of dates or inherit from it and override get_holidays to plug in
+    an own calendar (e.g. public holidays of a site).
+
+    Example:
+        cal = holidayCalendar(["2023-05-01", "2023-12-25"])
+        get_month_weekdays(1, delta_months=range(12), holiday_calendar=cal)
+    """
+
+    def __init__(self, holidays: list = None) -> None:
+        self._holidays = [] if holidays is None else list(holidays)
+
+    def get_holidays(self) -> list:
+        """
+        This function returns the holidays of the calendar.
+
+        Return:
+            - holidays (list): list of dates (date, datetime or 'YYYY-MM-DD' strings)
+        """
+        return self._holidays
+
+    def busdaycalendar(self) -> np.busdaycalendar:
+        """
+        This function returns the precomputed numpy business day table of the calendar.
+        The table is cached and shared between calendars with the same holidays.
+
+        Return:
+            - busdaycal (np.busdaycalendar): business day calendar (Mon-Fri without holidays)
+        """
+        holidays = np.asarray(self.get_holidays(), dtype="datetime64[D]")
+        return _get_busdaycalendar(tuple(np.unique(holidays).astype(str)))
+
+
+@lru_cache(maxsize=32)
+def _get_busdaycalendar(holidays: tuple) -> np.busdaycalendar:
+    return np.busdaycalendar(weekmask=WEEKMASK, holidays=list(holidays))
+
+
+def _get_today(today=None) -> np.ndarray:
+    if today is None:
+        today = datetime.today()
+    if isinstance(today, (date, str)):
+        today = str(today)[:10]
+    return np.asarray(today, dtype="datetime64[D]")
+
+
+def _get_busdaycal(holiday_calendar: holidayCalendar = None) -> np.busdaycalendar:
+    if holiday_calendar is None:
+        holiday_calendar = holidayCalendar()
+    return holiday_calendar.busdaycalendar()
+
+
+def _format_dates(dates: np.ndarray, date_format: str) -> np.ndarray:
+    if date_format == "%Y-%m-%d":
+        return np.datetime_as_string(dates, unit="D")
+    formatted = [d.strftime(date_format) for d in np.ravel(dates).astype(date)]
+    return np.asarray(formatted).reshape(np.shape(dates))
+
+
+def get_month_starts(delta_months=0, today=None) -> np.ndarray:
+    """
+    This function provides the first day of the month for one or many deltas of month.
+
+    Args:
+        - delta_months (int, list or np.ndarray): month(s) to add / substract from the month of today
+        - today (date, str or array-like): reference date(s), datetime.today() if not specified
+
+    Return:
+        - dates (np.ndarray): datetime64[D] array with the first day of each month
+    """
+    month = _get_today(today).astype("datetime64[M]")
+    return (month + np.asarray(delta_months, dtype=np.int64)).astype("datetime64[D]")
+
+
+def get_periods(delta_months=0, today=None) -> np.ndarray:
+    """
+    This function provides the periods 'YYYY-MM' for one or many deltas of month.
+    It is the vectorized version of str(get_year(delta)) + "-" + get_month(delta).
+
+    Args:
+        - delta_months (int, list or np.ndarray): month(s) to add / substract from the month of today
+        - today (date, str or array-like): reference date(s), datetime.today() if not specified
+
+    Return:
+        - periods (np.ndarray): array of strings in format 'YYYY-MM'
+    """
+    month = _get_today(today).astype("datetime64[M]")
+    return np.datetime_as_string(month + np.asarray(delta_months, dtype=np.int64))
+
+
+def get_period_range(start_delta: int, end_delta: int, today=None) -> np.ndarray:
+    """
+    This function provides all periods 'YYYY-MM' between two deltas of month (both included).
+
+    Args:
+        - start_delta (int): first month to add / substract from the month of today
+        - end_delta (int): last month to add / substract from the month of today
+        - today (date or str): reference date, datetime.today() if not specified
+
+    Return:
+        - periods (np.ndarray): array of strings in format 'YYYY-MM'
+    """
+    return get_periods(np.arange(start_delta, end_delta + 1), today=today)
+
+
+def get_months(delta_months=0, digit: int = 2, today=None) -> np.ndarray:
+    """
+    This function is the vectorized version of utils.get_month.
+
+    Args:
+        - delta_months (int, list or np.ndarray): month(s) to add / substract from the month of today
+        - digit (int): amount of digits to be returend (digit=3 in May, result will be 005)
+        - today (date, str or array-like): reference date(s), datetime.today() if not specified
+
+    Return:
+        - months (np.ndarray): array of month strings with the given digits
+    """
+    months = get_month_starts(delta_months, today).astype("datetime64[M]").astype(np.int64) % 12 + 1
+    return np.char.zfill(months.astype(str), digit)
+
+
+def get_years(delta_months=0, today=None) -> np.ndarray:
+    """
+    This function is the vectorized version of utils.get_year.
+
+    Args:
+        - delta_months (int, list or np.ndarray): month(s) to add / substract from the month of today
+        - today (date, str or array-like): reference date(s), datetime.today() if not specified
+
+    Return:
+        - years (np.ndarray): array of years as int
+    """
+    return get_month_starts(delta_months, today).astype("datetime64[Y]").astype(np.int64) + 1970
+
+
+def get_month_weekdays(
+    delta_working_days=0,
+    delta_months=0,
+    today=None,
+    holiday_calendar: holidayCalendar = None,
+    date_format: str = "%Y-%m-%d",
+) -> np.ndarray:
+    """
+    This function is the vectorized version of utils.get_month_weekday.
+    It returns the Nth working day for many months at once (arguments are broadcasted).
+
+    Args:
+        - delta_working_days (int, list or np.ndarray): Nth working day of the month
+        (0 will return the first day of the month)
+        - delta_months (int, list or np.ndarray): month(s) to add / substract from the month of today
+        - today (date, str or array-like): reference date(s), datetime.today() if not specified
+        - holiday_calendar (holidayCalendar): calendar with non working days besides weekends
+        - date_format (str): definition of the output date format (None returns datetime64[D])
+
+    Return:
+        - dates (np.ndarray): dates of the Nth working day of each month
+    """
+    delta_working_days = np.asarray(delta_working_days, dtype=np.int64)
+    assert np.all(delta_working_days >= 0), (
+        f"delta '{delta_working_days}' is not acceptable by function get_month_weekdays. "
+        + "Please use values higher then 0"
+    )
+    month_starts = get_month_starts(delta_months, today)
+    dates = np.where(
+        delta_working_days == 0,
+        month_starts,
+        np.busday_offset(
+            month_starts,
+            np.maximum(delta_working_days - 1, 0),
+            roll="forward",
+            busdaycal=_get_busdaycal(holiday_calendar),
+        ),
+    )
+    return dates if date_format is None else _format_dates(dates, date_format)
+
+
+def get_month_last_weekdays(
+    delta_months=0,
+    today=None,
+    holiday_calendar: holidayCalendar = None,
+    date_format: str = "%Y-%m-%d",
+) -> np.ndarray:
+    """
+    This function returns the last working day for many months at once.
+
+    Args:
+        - delta_months (int, list or np.ndarray): month(s) to add / substract from the month of today
+        - today (date, str or array-like): reference date(s), datetime.today() if not specified
+        - holiday_calendar (holidayCalendar): calendar with non working days besides weekends
+        - date_format (str): definition of the output date format (None returns datetime64[D])
+
+    Return:
+        - dates (np.ndarray): dates of the last working day of each month
+    """
+    month_ends = get_month_starts(np.asarray(delta_months) + 1, today) - 1
+    dates = np.busday_offset(month_ends, 0, roll="backward", busdaycal=_get_busdaycal(holiday_calendar))
+    return dates if date_format is None else _format_dates(dates, date_format)
+
+
+def get_last_weekdays(
+    delta=-1,
+    today=None,
+    holiday_calendar: holidayCalendar = None,
+    date_format: str = "%Y-%m-%d",
+) -> np.ndarray:
+    """
+    This function is the vectorized version of utils.get_last_weekday.
+    It returns the last working day on or before today + delta (arguments are broadcasted).
+
+    Args:
+        - delta (int, list or np.ndarray): days to add / substract from today (values between 0 & -6)
+        - today (date, str or array-like): reference date(s), datetime.today() if not specified
+        - holiday_calendar (holidayCalendar): calendar with non working days besides weekends
+        - date_format (str): definition of the output date format (None returns datetime64[D])
+
+    Return:
+        - dates (np.ndarray): dates of the last working day
+    """
+    delta = np.asarray(delta, dtype=np.int64)
+    assert np.all((delta >= -6) & (delta <= 0)), (
+        f"delta '{delta}' is not acceptable by function get_last_weekdays. "
+        + "Please use values between 0 & -6"
+    )
+    dates = np.busday_offset(
+        _get_today(today) + delta, 0, roll="backward", busdaycal=_get_busdaycal(holiday_calendar)
+    )
+    return dates if date_format is None else _format_dates(dates, date_format)
+
+
+if __name__ == "__main__":
+    # example how to get the periods and the 3rd working day of the last 12 months
+    print(get_period_range(-12, -1))
+    print(get_month_weekdays(3, delta_months=np.arange(-12, 0)))
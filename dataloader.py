@@ -3,6 +3,7 @@ import sys
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from connector import ftpConnector  # noqa: E402
+from nl_store import nlRecoStore  # noqa: E402
 from utils import get_month, get_year  # noqa: E402
 
 
@@ -30,6 +31,8 @@ class dataLoader(object):
         source: str = "wd",
         force_actual_month: bool = False,
         overwrite_existing: bool = False,
+        store_path: str = None,
+        remove_ingested: bool = False,
     ) -> list:
         """
         This function is to download the NL Reconciliation for People Analytics Team.
@@ -42,6 +45,10 @@ class dataLoader(object):
             (e.g. YYYY-04 in May or YYYY-03 in April)
             - overwrite_existing (bool): force overwrite of the file
             (download will be skipped if file with exact matching name is in targe folder (out_path))
+            - store_path (str): root path of a nlRecoStore to ingest the files into (not used if not specified)
+            (download will be skipped if dataset and period of the file are already in the store
+            or older than the latest stored period, this overrides overwrite_existing)
+            - remove_ingested (bool): remove the files from out_path once they are ingested into the store
 
         Result:
             - files (list): list of filenames which ar available in the target folder (downloaded new or pre-available)
@@ -114,11 +121,19 @@ class dataLoader(object):
             os.makedirs(out_path, exist_ok=True)
 
         # remove available files if not forced to overwrite
+        files_to_download = files
         if not overwrite_existing:
             files_to_download = [
                 file for file in files if file not in os.listdir(out_path)
             ]
 
+        # remove files already ingested into the local store or older than the stored periods
+        store = None if store_path is None else nlRecoStore(store_path)
+        if store is not None:
+            files_to_download = [
+                file for file in files_to_download if store.can_ingest(file)
+            ]
+
         # download the files if needed
         if len(files_to_download) > 0:
             self.sns.download_file_list(
@@ -128,6 +143,17 @@ class dataLoader(object):
                 local_path=out_path,
             )
 
+        # ingest the files into the local store
+        if store is not None:
+            for file in sorted(files, key=lambda f: f.split("_updated_")[-1]):
+                filepath = os.path.join(out_path, file)
+                if store.can_ingest(file):
+                    store.ingest(filepath)
+                elif not store.has_snapshot(file):
+                    print(f"\t{file} is older than the latest stored period, skip ingest")
+                if remove_ingested and store.has_snapshot(file) and os.path.exists(filepath):
+                    os.remove(filepath)
+
         # return the downloaded and available files
         return files
 
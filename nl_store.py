@@ -0,0 +1,379 @@
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+SNAPSHOT_PATTERN = re.compile(r"(historical_nl_(?:WD_)?\d{4})_updated_(\d{4})-(\d{2})\.parquet$")
+PERIOD_PATTERN = re.compile(r"^\d{4}-\d{2}$")
+KEY_COLUMNS = ["_row_hash", "_row_nr"]
+BASE_FILE = "base.parquet"
+ADDED_FILE = "added.parquet"
+REMOVED_FILE = "removed.parquet"
+METADATA_FILE = "_metadata.json"
+TMP_PREFIX = ".tmp-"
+
+
+class nlRecoStore(object):
+    """
+    This class is a local store for the NL Reconciliation history.
+    Instead of keeping every monthly snapshot, only the row level changes against
+    the previous snapshot are kept in a year / month partitioned parquet dataset:
+
+        <root_path>/<dataset>/_metadata.json                      (columns, dtypes and index of the dataset)
+        <root_path>/<dataset>/year=YYYY/month=MM/added.parquet    (rows added since the previous month)
+        <root_path>/<dataset>/year=YYYY/month=MM/removed.parquet  (rows removed since the previous month)
+        <root_path>/<dataset>/year=YYYY/month=MM/base.parquet     (full rows, latest or compacted month)
+
+    A changed row is stored as removed + added. The deltas can be applied in both directions,
+    so any month is rebuilt from the nearest base. Ingest moves the base to the new month,
+    compact can move it to an older month that is read often.
+    The dataset is the snapshot name without the update month (e.g. 'historical_nl_WD_2023').
+
+    Example:
+        store = nlRecoStore("data/nl_store")
+        store.ingest("data/historical_nl_WD_2023_updated_2023-09.parquet")
+        df = store.read("historical_nl_WD_2023", "2023-09")
+    """
+
+    def __init__(self, root_path: str) -> None:
+        self.root_path = Path(root_path)
+
+    def list_datasets(self) -> list:
+        """
+        This function lists the datasets available in the store.
+
+        Return:
+            - datasets (list): sorted list of dataset names
+        """
+        if not self.root_path.exists():
+            return []
+        return sorted(p.name for p in self.root_path.iterdir() if p.is_dir() and len(self.list_periods(p.name)) > 0)
+
+    def list_periods(self, dataset: str) -> list:
+        """
+        This function lists the completely stored periods of a dataset.
+
+        Args:
+            - dataset (str): name of the dataset (e.g. 'historical_nl_WD_2023')
+
+        Return:
+            - periods (list): sorted list of periods in format 'YYYY-MM'
+        """
+        return sorted(
+            f"{year.name[5:]}-{month.name[6:]}"
+            for year in (self.root_path / dataset).glob("year=*")
+            for month in year.glob("month=*")
+            if (month / ADDED_FILE).exists() and (month / REMOVED_FILE).exists()
+        )
+
+    def has_snapshot(self, filepath: str) -> bool:
+        """
+        This function checks if a snapshot is already stored.
+
+        Args:
+            - filepath (str): path or name of the snapshot file
+
+        Return:
+            - stored (bool): True if dataset and period of the snapshot are stored
+        """
+        dataset, period = parse_snapshot_name(filepath)
+        return period in self.list_periods(dataset)
+
+    def can_ingest(self, filepath: str) -> bool:
+        """
+        This function checks if a snapshot is newer than the latest stored period of its dataset.
+
+        Args:
+            - filepath (str): path or name of the snapshot file
+
+        Return:
+            - new (bool): True if the snapshot can be ingested
+        """
+        dataset, period = parse_snapshot_name(filepath)
+        periods = self.list_periods(dataset)
+        return len(periods) == 0 or period > periods[-1]
+
+    def ingest(self, filepath: str, dataset: str = None, period: str = None) -> dict:
+        """
+        This function ingests a full snapshot and stores only the delta to the previous period.
+        Snapshots have to be ingested in chronological order, already stored periods are skipped.
+        The period is only listed once all its files are written.
+
+        Args:
+            - filepath (str): path of the snapshot parquet file
+            - dataset (str): name of the dataset, taken from the filename if not specified
+            - period (str): period of the snapshot 'YYYY-MM', taken from the filename if not specified
+
+        Result:
+            - stats (dict): dataset, period and amount of added, removed and total rows
+        """
+        if dataset is None or period is None:
+            _dataset, _period = parse_snapshot_name(filepath)
+            dataset = _dataset if dataset is None else dataset
+            period = _period if period is None else period
+        _check_period(period)
+
+        periods = self.list_periods(dataset)
+        if period in periods:
+            print(f"\tperiod {period} of {dataset} already stored, skip {filepath}")
+            return {"dataset": dataset, "period": period, "added": 0, "removed": 0, "rows": None}
+        if len(periods) > 0 and period < periods[-1]:
+            raise ValueError(
+                f"period {period} is older than the latest stored period {periods[-1]} of {dataset}. "
+                "Snapshots have to be ingested in chronological order."
+            )
+
+        snapshot, index = _prepare_frame(pd.read_parquet(filepath))
+        metadata = _get_metadata(snapshot, index)
+        if len(periods) == 0:
+            previous = snapshot.iloc[:0].assign(_row_hash=pd.Series(dtype="uint64"), _row_nr=pd.Series(dtype="int64"))
+        else:
+            _check_metadata(dataset, self._read_metadata(dataset), metadata)
+            previous = self._read_state(dataset, periods[-1])
+        snapshot = _add_keys(snapshot)
+
+        # build the delta to the previous period
+        previous_keys = pd.MultiIndex.from_frame(previous[KEY_COLUMNS])
+        snapshot_keys = pd.MultiIndex.from_frame(snapshot[KEY_COLUMNS])
+        added = snapshot[~snapshot_keys.isin(previous_keys)]
+        removed = previous[~previous_keys.isin(snapshot_keys)]
+
+        # write the partition to a temporary directory and move it into place when complete
+        partition = self._partition_path(dataset, period)
+        tmp_partition = partition.with_name(TMP_PREFIX + partition.name)
+        if tmp_partition.exists():
+            shutil.rmtree(tmp_partition)
+        os.makedirs(tmp_partition)
+        try:
+            added.to_parquet(tmp_partition / ADDED_FILE, index=False)
+            removed.to_parquet(tmp_partition / REMOVED_FILE, index=False)
+            snapshot.to_parquet(tmp_partition / BASE_FILE, index=False)
+            if len(periods) == 0:
+                self._write_metadata(dataset, metadata)
+            os.replace(tmp_partition, partition)
+        finally:
+            if tmp_partition.exists():
+                shutil.rmtree(tmp_partition)
+
+        # the new period is the base now
+        self._remove_bases(dataset, keep=period)
+
+        return {
+            "dataset": dataset,
+            "period": period,
+            "added": len(added),
+            "removed": len(removed),
+            "rows": len(snapshot),
+        }
+
+    def read(self, dataset: str, period: str = None) -> pd.DataFrame:
+        """
+        This function returns the dataset as it was valid in the given period ("as of" view),
+        this is the latest stored snapshot before or in the period.
+        The row order of the snapshot is not preserved.
+
+        Args:
+            - dataset (str): name of the dataset (e.g. 'historical_nl_WD_2023')
+            - period (str): period 'YYYY-MM', latest stored period if not specified
+
+        Result:
+            - df (pd.DataFrame): rows of the dataset valid in the given period
+        """
+        if period is not None:
+            _check_period(period)
+        metadata = self._read_metadata(dataset)
+        state = self._read_state(dataset, period).drop(columns=KEY_COLUMNS).reset_index(drop=True)
+        if len(metadata["index"]) > 0:
+            state = state.set_index(metadata["index"])
+            state.index.names = [None if name.startswith("__index_level_") else name for name in state.index.names]
+        return state
+
+    def compact(self, dataset: str, period: str = None) -> str:
+        """
+        This function moves the base of the dataset to the given period.
+        Reading periods close to the base is faster, all periods stay readable.
+
+        Args:
+            - dataset (str): name of the dataset (e.g. 'historical_nl_WD_2023')
+            - period (str): period 'YYYY-MM' of the new base, latest stored period if not specified
+
+        Result:
+            - period (str): period of the new base
+        """
+        if period is not None:
+            _check_period(period)
+        periods = self.list_periods(dataset)
+        if len(periods) == 0:
+            raise FileNotFoundError(f"dataset {dataset} not found in {self.root_path}")
+        if period is None:
+            period = periods[-1]
+        if period not in periods:
+            raise ValueError(f"period {period} of {dataset} not stored, available periods are {periods}")
+
+        partition = self._partition_path(dataset, period)
+        if not (partition / BASE_FILE).exists():
+            state = self._read_state(dataset, period)
+            state.to_parquet(partition / (BASE_FILE + ".tmp"), index=False)
+            os.replace(partition / (BASE_FILE + ".tmp"), partition / BASE_FILE)
+        self._remove_bases(dataset, keep=period)
+
+        return period
+
+    def _partition_path(self, dataset: str, period: str) -> Path:
+        year, month = period.split("-")
+        return self.root_path / dataset / f"year={year}" / f"month={month}"
+
+    def _remove_bases(self, dataset: str, keep: str) -> None:
+        for _period in self.list_periods(dataset):
+            base = self._partition_path(dataset, _period) / BASE_FILE
+            if _period != keep and base.exists():
+                os.remove(base)
+
+    def _read_metadata(self, dataset: str) -> dict:
+        with open(self.root_path / dataset / METADATA_FILE) as f:
+            return json.load(f)
+
+    def _write_metadata(self, dataset: str, metadata: dict) -> None:
+        filepath = self.root_path / dataset / METADATA_FILE
+        with open(filepath.with_name(METADATA_FILE + ".tmp"), "w") as f:
+            json.dump(metadata, f, indent=4)
+        os.replace(filepath.with_name(METADATA_FILE + ".tmp"), filepath)
+
+    def _read_state(self, dataset: str, period: str = None) -> pd.DataFrame:
+        periods = self.list_periods(dataset)
+        if len(periods) == 0:
+            raise FileNotFoundError(f"dataset {dataset} not found in {self.root_path}")
+        if period is None:
+            period = periods[-1]
+        if period < periods[0]:
+            raise ValueError(f"period {period} of {dataset} not available, oldest stored period is {periods[0]}")
+        period = max(p for p in periods if p <= period)
+
+        # start from the nearest base
+        bases = [p for p in periods if (self._partition_path(dataset, p) / BASE_FILE).exists()]
+        if len(bases) == 0:
+            raise FileNotFoundError(f"no base found for dataset {dataset} in {self.root_path}")
+        base = min(bases, key=lambda p: abs(periods.index(p) - periods.index(period)))
+        state = pd.read_parquet(self._partition_path(dataset, base) / BASE_FILE)
+        _check_keys(dataset, state)
+
+        # apply the deltas forward or backward
+        for _period in [p for p in periods if base < p <= period]:
+            partition = self._partition_path(dataset, _period)
+            state = _apply_delta(
+                state,
+                pd.read_parquet(partition / REMOVED_FILE, columns=KEY_COLUMNS),
+                pd.read_parquet(partition / ADDED_FILE),
+            )
+        for _period in [p for p in reversed(periods) if period < p <= base]:
+            partition = self._partition_path(dataset, _period)
+            state = _apply_delta(
+                state,
+                pd.read_parquet(partition / ADDED_FILE, columns=KEY_COLUMNS),
+                pd.read_parquet(partition / REMOVED_FILE),
+            )
+
+        return _restore_dtypes(state, self._read_metadata(dataset)["columns"])
+
+
+def parse_snapshot_name(filepath: str) -> tuple:
+    """
+    This function extracts the dataset and the period from a snapshot filename.
+
+    Example:
+        - filepath: 'data/historical_nl_WD_2023_updated_2023-09.parquet'
+        return: ('historical_nl_WD_2023', '2023-09')
+
+    Args:
+        - filepath (str): path or name of the snapshot file
+
+    Return:
+        - dataset, period (tuple): name of the dataset and period 'YYYY-MM'
+    """
+    result = SNAPSHOT_PATTERN.search(os.path.basename(filepath))
+    if result is None:
+        raise ValueError(f"filename {filepath} does not match pattern '{SNAPSHOT_PATTERN.pattern}'")
+    return result.group(1), f"{result.group(2)}-{result.group(3)}"
+
+
+def _check_period(period: str) -> None:
+    # periods are compared as strings and used in the partition path
+    if not isinstance(period, str) or PERIOD_PATTERN.match(period) is None or not 1 <= int(period[5:]) <= 12:
+        raise ValueError(f"period '{period}' is not acceptable. Please use the format 'YYYY-MM'")
+
+
+def _prepare_frame(df: pd.DataFrame) -> tuple:
+    # a restored index is kept as columns and set again by read
+    if isinstance(df.index, pd.RangeIndex) and df.index.name is None:
+        return df.reset_index(drop=True), []
+    index = [f"__index_level_{i}__" if name is None else name for i, name in enumerate(df.index.names)]
+    return df.rename_axis(index).reset_index(), index
+
+
+def _get_metadata(df: pd.DataFrame, index: list) -> dict:
+    return {
+        "pandas_version": pd.__version__,
+        "columns": {column: str(dtype) for column, dtype in df.dtypes.items()},
+        "index": index,
+    }
+
+
+def _check_metadata(dataset: str, stored: dict, metadata: dict) -> None:
+    # the row hash depends on the columns and dtypes
+    for key in ["columns", "index"]:
+        if stored[key] != metadata[key]:
+            raise ValueError(
+                f"{key} of the snapshot do not match the stored dataset {dataset}.\n"
+                f"stored: {stored[key]}\nsnapshot: {metadata[key]}"
+            )
+
+
+def _check_keys(dataset: str, state: pd.DataFrame, sample_size: int = 100) -> None:
+    # the stored row hashes have to match the hashing of the installed pandas version
+    sample = state.head(sample_size)
+    row_hash = pd.util.hash_pandas_object(sample.drop(columns=KEY_COLUMNS), index=False)
+    if not (row_hash.values == sample["_row_hash"].values).all():
+        raise ValueError(
+            f"stored row hashes of dataset {dataset} do not match the hashing of pandas {pd.__version__}. "
+            "Please use the pandas version the store was written with (see _metadata.json)."
+        )
+
+
+def _add_keys(df: pd.DataFrame) -> pd.DataFrame:
+    # the row hash identifies a row, the row number separates identical rows
+    row_hash = pd.util.hash_pandas_object(df, index=False)
+    return df.assign(_row_hash=row_hash.values, _row_nr=row_hash.groupby(row_hash).cumcount().values)
+
+
+def _apply_delta(state: pd.DataFrame, removed_keys: pd.DataFrame, added: pd.DataFrame) -> pd.DataFrame:
+    if len(removed_keys) > 0:
+        state_keys = pd.MultiIndex.from_frame(state[KEY_COLUMNS])
+        state = state[~state_keys.isin(pd.MultiIndex.from_frame(removed_keys))]
+    if len(added) > 0:
+        state, added = _union_categories(state, added)
+        state = pd.concat([state, added], ignore_index=True)
+    return state
+
+
+def _union_categories(state: pd.DataFrame, added: pd.DataFrame) -> tuple:
+    # pd.concat turns categoricals with different categories into their values
+    categories = {}
+    for column in state.columns:
+        dtypes = [state[column].dtype, added[column].dtype]
+        if all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes):
+            union = pd.api.types.union_categoricals([state[column].array, added[column].array], ignore_order=True)
+            categories[column] = pd.CategoricalDtype(union.categories, ordered=state[column].dtype.ordered)
+    return state.astype(categories), added.astype(categories)
+
+
+def _restore_dtypes(state: pd.DataFrame, columns: dict) -> pd.DataFrame:
+    # cast the rebuilt state back to the dtypes of the snapshots
+    dtypes = {
+        column: dtype
+        for column, dtype in columns.items()
+        if str(state[column].dtype) != dtype
+    }
+    return state.astype(dtypes)
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+import utils
+from business_calendar import (
+    get_last_weekdays,
+    get_month_last_weekdays,
+    get_month_weekdays,
+    get_months,
+    get_period_range,
+    get_periods,
+    get_years,
+    holidayCalendar,
+)
+
+REFERENCE_DAYS = [datetime(2023, 1, 1) + timedelta(days) for days in range(800)]
+
+
+def _loop_last_weekday(today, delta):
+    # day by day loop of the former utils.get_last_weekday
+    while True:
+        _date = today + timedelta(delta)
+        if _date.weekday() < 5:
+            return _date.strftime("%Y-%m-%d")
+        delta -= 1
+
+
+def _loop_month_weekday(today, delta_working_days):
+    # day by day loop of the former utils.get_month_weekday
+    days = 0
+    _working_days = 0
+    while True:
+        _date = today.replace(day=1) + timedelta(days)
+        if _date.weekday() < 5:
+            _working_days += 1
+        if _working_days >= delta_working_days:
+            return _date.strftime("%Y-%m-%d")
+        days += 1
+
+
+@pytest.mark.parametrize("delta", range(-6, 1))
+def test_get_last_weekdays_matches_loop(delta):
+    expected = [_loop_last_weekday(today, delta) for today in REFERENCE_DAYS]
+    result = get_last_weekdays(delta, today=[today.strftime("%Y-%m-%d") for today in REFERENCE_DAYS])
+    assert result.tolist() == expected
+
+
+@pytest.mark.parametrize("delta_working_days", range(0, 8))
+def test_get_month_weekdays_matches_loop(delta_working_days):
+    expected = [_loop_month_weekday(today, delta_working_days) for today in REFERENCE_DAYS]
+    result = [str(get_month_weekdays(delta_working_days, today=today)) for today in REFERENCE_DAYS]
+    assert result == expected
+
+
+def test_periods_match_get_year_and_get_month():
+    for today in REFERENCE_DAYS[::7]:
+        expected = [
+            f"{today.year + (today.month + delta - 1) // 12}-{(today.month - 1 + delta) % 12 + 1:02d}"
+            for delta in range(-25, 25)
+        ]
+        assert get_periods(np.arange(-25, 25), today=today).tolist() == expected
+
+
+def test_month_and_year_rollover():
+    assert get_period_range(-2, 2, today="2024-01-15").tolist() == [
+        "2023-11",
+        "2023-12",
+        "2024-01",
+        "2024-02",
+        "2024-03",
+    ]
+    assert get_months([-1, 0, 11, 12], digit=3, today="2023-12-31").tolist() == ["011", "012", "011", "012"]
+    assert get_years([-1, 0, 1, 13], today="2023-12-31").tolist() == [2023, 2023, 2024, 2025]
+
+
+def test_get_month_last_weekdays():
+    result = get_month_last_weekdays(np.arange(4), today="2024-01-15")
+    assert result.tolist() == ["2024-01-31", "2024-02-29", "2024-03-29", "2024-04-30"]
+
+
+def test_holiday_calendar():
+    calendar = holidayCalendar(["2024-05-01", "2024-12-31", "2024-12-25"])
+    assert str(get_month_weekdays(1, delta_months=4, today="2024-01-15", holiday_calendar=calendar)) == "2024-05-02"
+    assert str(get_month_last_weekdays(11, today="2024-01-15", holiday_calendar=calendar)) == "2024-12-30"
+    assert str(get_last_weekdays(0, today="2024-12-25", holiday_calendar=calendar)) == "2024-12-24"
+
+
+def test_custom_holiday_calendar():
+    class newYearCalendar(holidayCalendar):
+        def get_holidays(self) -> list:
+            return [f"{year}-01-01" for year in range(2020, 2030)]
+
+    result = get_month_weekdays(
+        1, delta_months=np.arange(0, 48, 12), today="2024-01-15", holiday_calendar=newYearCalendar()
+    )
+    assert result.tolist() == ["2024-01-02", "2025-01-02", "2026-01-02", "2027-01-04"]
+
+
+def test_broadcasting():
+    result = get_month_weekdays([[1], [3]], delta_months=np.arange(3), today="2024-01-15")
+    assert result.shape == (2, 3)
+    assert result.tolist() == [
+        ["2024-01-01", "2024-02-01", "2024-03-01"],
+        ["2024-01-03", "2024-02-05", "2024-03-05"],
+    ]
+
+
+def test_date_format():
+    result = get_month_weekdays(3, delta_months=[0, 1], today="2024-01-15", date_format=None)
+    assert result.dtype == np.dtype("datetime64[D]")
+    assert result.tolist() == [datetime(2024, 1, 3).date(), datetime(2024, 2, 5).date()]
+    result = get_last_weekdays([-1, 0], today="2024-01-15", date_format="%d.%m.%Y")
+    assert result.tolist() == ["12.01.2024", "15.01.2024"]
+
+
+def test_invalid_deltas():
+    with pytest.raises(AssertionError):
+        get_last_weekdays(-7)
+    with pytest.raises(AssertionError):
+        get_month_weekdays([1, -1])
+
+
+def test_utils_keep_time_of_today():
+    result = datetime.strptime(utils.get_last_weekday(0, "%Y-%m-%d %H:%M:%S"), "%Y-%m-%d %H:%M:%S")
+    assert abs((datetime.today() - result).total_seconds()) % 86400 < 60
@@ -0,0 +1,109 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from dataloader import dataLoader
+from nl_store import nlRecoStore
+
+DATASET = "historical_nl_WD_2023"
+
+
+class fakeConnector(object):
+    # serves the files of a local folder instead of the sns ftp server
+    def __init__(self, remote_path):
+        self.remote_path = remote_path
+        self.downloaded = []
+
+    def _list_files(self, auth_dict, remote_path):
+        return sorted(os.listdir(self.remote_path))
+
+    def download_file_list(self, auth_dict, file_list, remote_path="", local_path=""):
+        for file in file_list:
+            shutil.copy(os.path.join(self.remote_path, file), os.path.join(local_path, file))
+        self.downloaded += list(file_list)
+
+
+@pytest.fixture
+def remote_path(tmp_path):
+    remote_path = tmp_path / "remote"
+    os.makedirs(remote_path)
+    for month in range(1, 4):
+        df = pd.DataFrame({"id": range(month + 1), "value": [month] * (month + 1)})
+        df.to_parquet(remote_path / f"{DATASET}_updated_2023-{month:02d}.parquet", index=False)
+    return remote_path
+
+
+@pytest.fixture
+def dl(remote_path):
+    dl = dataLoader({"username": "user", "password": "password"})
+    dl.sns = fakeConnector(remote_path)
+    return dl
+
+
+@pytest.fixture
+def ingested(monkeypatch):
+    # record the ingested files and check they are available while ingested
+    ingested = []
+    ingest = nlRecoStore.ingest
+
+    def recording_ingest(self, filepath, *args, **kwargs):
+        assert os.path.exists(filepath)
+        ingested.append(os.path.basename(filepath))
+        return ingest(self, filepath, *args, **kwargs)
+
+    monkeypatch.setattr(nlRecoStore, "ingest", recording_ingest)
+    return ingested
+
+
+def test_download_overwrite_existing(dl, tmp_path):
+    out_path = tmp_path / "out"
+    files = dl.download_nl_reco([2023], out_path)
+    assert files == [f"{DATASET}_updated_2023-03.parquet"]
+    dl.download_nl_reco([2023], out_path)
+    assert dl.sns.downloaded == files
+    dl.download_nl_reco([2023], out_path, overwrite_existing=True)
+    assert dl.sns.downloaded == files * 2
+
+
+def test_download_stored_snapshot(dl, tmp_path, remote_path, ingested):
+    store = nlRecoStore(tmp_path / "store")
+    store.ingest(remote_path / f"{DATASET}_updated_2023-03.parquet")
+    ingested.clear()
+
+    dl.download_nl_reco([2023], tmp_path / "out", overwrite_existing=True, store_path=tmp_path / "store")
+    assert dl.sns.downloaded == []
+    assert ingested == []
+    assert os.listdir(tmp_path / "out") == []
+
+
+def test_download_older_snapshot(dl, tmp_path, remote_path, ingested):
+    store = nlRecoStore(tmp_path / "store")
+    store.ingest(remote_path / f"{DATASET}_updated_2023-03.parquet", period="2023-05")
+    ingested.clear()
+
+    files = dl.download_nl_reco([2023], tmp_path / "out", store_path=tmp_path / "store")
+    assert files == [f"{DATASET}_updated_2023-03.parquet"]
+    assert dl.sns.downloaded == []
+    assert ingested == []
+
+
+def test_download_remove_ingested(dl, tmp_path, ingested):
+    out_path = tmp_path / "out"
+    files = dl.download_nl_reco([2023], out_path, store_path=tmp_path / "store", remove_ingested=True)
+    assert dl.sns.downloaded == files
+    assert ingested == files
+    assert os.listdir(out_path) == []
+    assert nlRecoStore(tmp_path / "store").list_periods(DATASET) == ["2023-03"]
+
+
+def test_download_keep_failed_ingest(dl, tmp_path, monkeypatch):
+    def fail(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(nlRecoStore, "ingest", fail)
+    out_path = tmp_path / "out"
+    with pytest.raises(KeyboardInterrupt):
+        dl.download_nl_reco([2023], out_path, store_path=tmp_path / "store", remove_ingested=True)
+    assert os.listdir(out_path) == [f"{DATASET}_updated_2023-03.parquet"]
@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import nl_store
+from nl_store import nlRecoStore, parse_snapshot_name
+
+DATASET = "historical_nl_WD_2023"
+PERIODS = [f"2023-{month:02d}" for month in range(1, 7)]
+
+
+def _assert_same_rows(result, expected):
+    columns = list(expected.columns)
+    pd.testing.assert_frame_equal(
+        result[columns].sort_values(columns).reset_index(drop=True),
+        expected.sort_values(columns).reset_index(drop=True),
+    )
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    # monthly snapshots with changed, removed, added and duplicated rows
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"id": np.arange(200), "name": [f"name_{i}" for i in range(200)], "value": rng.random(200)})
+    df = pd.concat([df, df.iloc[:3]], ignore_index=True)
+    snapshots = {}
+    for i, period in enumerate(PERIODS):
+        df = df.copy()
+        changed = rng.choice(len(df), 10, replace=False)
+        df.loc[changed, "value"] = rng.random(10)
+        df = df.drop(index=df.index[3:6]).reset_index(drop=True)
+        df = pd.concat(
+            [df, pd.DataFrame({"id": [1000 + i], "name": ["new"], "value": [0.5]}), df.iloc[:1]], ignore_index=True
+        )
+        filepath = tmp_path / f"{DATASET}_updated_{period}.parquet"
+        df.to_parquet(filepath, index=False)
+        snapshots[period] = (filepath, df)
+    return snapshots
+
+
+@pytest.fixture
+def store(tmp_path, snapshots):
+    store = nlRecoStore(tmp_path / "store")
+    for filepath, _ in snapshots.values():
+        store.ingest(filepath)
+    return store
+
+
+def test_parse_snapshot_name():
+    assert parse_snapshot_name("data/historical_nl_WD_2023_updated_2023-09.parquet") == (DATASET, "2023-09")
+    assert parse_snapshot_name("historical_nl_2022_updated_2023-01.parquet") == ("historical_nl_2022", "2023-01")
+    with pytest.raises(ValueError):
+        parse_snapshot_name("nominativeList_03_2023.csv")
+
+
+def test_read_after_ingest(store, snapshots):
+    assert store.list_datasets() == [DATASET]
+    assert store.list_periods(DATASET) == PERIODS
+    for period, (_, df) in snapshots.items():
+        _assert_same_rows(store.read(DATASET, period), df)
+    _assert_same_rows(store.read(DATASET), snapshots[PERIODS[-1]][1])
+
+
+def test_read_as_of(store, snapshots):
+    _assert_same_rows(store.read(DATASET, "2023-12"), snapshots[PERIODS[-1]][1])
+    with pytest.raises(ValueError):
+        store.read(DATASET, "2022-12")
+
+
+def test_only_delta_stored(store, snapshots):
+    stats = store.ingest(snapshots[PERIODS[-1]][0], period="2023-07")
+    assert (stats["added"], stats["removed"]) == (0, 0)
+    bases = list((store.root_path / DATASET).glob("year=*/month=*/base.parquet"))
+    assert bases == [store.root_path / DATASET / "year=2023" / "month=07" / "base.parquet"]
+
+
+def test_duplicate_rows(store, snapshots):
+    for period, (_, df) in snapshots.items():
+        result = store.read(DATASET, period)
+        assert result.duplicated().sum() == df.duplicated().sum() > 0
+
+
+def test_compact_keeps_history(store, snapshots):
+    assert store.compact(DATASET, "2023-03") == "2023-03"
+    assert store.list_periods(DATASET) == PERIODS
+    for period, (_, df) in snapshots.items():
+        _assert_same_rows(store.read(DATASET, period), df)
+
+
+def test_compact_invalid_input(tmp_path, store):
+    with pytest.raises(FileNotFoundError):
+        nlRecoStore(tmp_path / "empty").compact(DATASET)
+    with pytest.raises(ValueError):
+        store.compact(DATASET, "2024-01")
+
+
+def test_out_of_order_ingest(tmp_path, snapshots):
+    store = nlRecoStore(tmp_path / "store")
+    store.ingest(snapshots["2023-03"][0])
+    with pytest.raises(ValueError):
+        store.ingest(snapshots["2023-02"][0])
+    assert store.ingest(snapshots["2023-03"][0])["rows"] is None
+    assert store.list_periods(DATASET) == ["2023-03"]
+
+
+def test_interrupted_ingest(tmp_path, snapshots, monkeypatch):
+    store = nlRecoStore(tmp_path / "store")
+    store.ingest(snapshots["2023-01"][0])
+
+    def fail(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    for target in ["_read_state", "_remove_bases"]:
+        with monkeypatch.context() as m:
+            m.setattr(nlRecoStore, target, fail)
+            with pytest.raises(KeyboardInterrupt):
+                store.ingest(snapshots["2023-02"][0])
+        if target == "_read_state":
+            assert store.list_periods(DATASET) == ["2023-01"]
+        _assert_same_rows(store.read(DATASET), snapshots[store.list_periods(DATASET)[-1]][1])
+
+    with monkeypatch.context() as m:
+        m.setattr(pd.DataFrame, "to_parquet", fail)
+        with pytest.raises(KeyboardInterrupt):
+            store.ingest(snapshots["2023-03"][0])
+    assert store.list_periods(DATASET) == ["2023-01", "2023-02"]
+    assert list((store.root_path / DATASET).glob("year=*/.tmp-*")) == []
+
+    store.ingest(snapshots["2023-03"][0])
+    for period in ["2023-01", "2023-02", "2023-03"]:
+        _assert_same_rows(store.read(DATASET, period), snapshots[period][1])
+
+
+def test_named_index(tmp_path):
+    store = nlRecoStore(tmp_path / "store")
+    df = pd.DataFrame({"id": [1, 2, 3], "value": [0.1, 0.2, 0.3]}).set_index("id")
+    df.to_parquet(tmp_path / f"{DATASET}_updated_2023-01.parquet")
+    store.ingest(tmp_path / f"{DATASET}_updated_2023-01.parquet")
+    pd.testing.assert_frame_equal(store.read(DATASET).sort_index(), df)
+
+
+def test_dtype_change(store, tmp_path, snapshots):
+    df = snapshots[PERIODS[-1]][1].astype({"id": "float64"})
+    df.to_parquet(tmp_path / f"{DATASET}_updated_2023-07.parquet", index=False)
+    with pytest.raises(ValueError):
+        store.ingest(tmp_path / f"{DATASET}_updated_2023-07.parquet")
+
+
+def test_hash_change(store, monkeypatch):
+    hash_pandas_object = pd.util.hash_pandas_object
+    monkeypatch.setattr(
+        nl_store.pd.util, "hash_pandas_object", lambda *args, **kwargs: hash_pandas_object(*args, **kwargs) + 1
+    )
+    with pytest.raises(ValueError):
+        store.read(DATASET)
+
+
+def test_categorical_dtype(tmp_path):
+    store = nlRecoStore(tmp_path / "store")
+    categories = {"2023-01": ["A", "B"], "2023-02": ["A", "C"], "2023-03": ["D", "C"]}
+    for period, values in categories.items():
+        df = pd.DataFrame({"id": [1, 2], "category": pd.Categorical(values)})
+        df.to_parquet(tmp_path / f"{DATASET}_updated_{period}.parquet", index=False)
+        store.ingest(tmp_path / f"{DATASET}_updated_{period}.parquet")
+
+    # read periods before and after the base
+    for base in ["2023-03", "2023-01", "2023-02"]:
+        store.compact(DATASET, base)
+        for period, values in categories.items():
+            result = store.read(DATASET, period).sort_values("id")
+            assert isinstance(result["category"].dtype, pd.CategoricalDtype)
+            assert result["category"].astype(str).tolist() == values
+
+
+@pytest.mark.parametrize("period", ["2023-1", "2023-13", "2023/02", "../2023-02", "2023-02-01"])
+def test_invalid_period(store, snapshots, period):
+    with pytest.raises(ValueError):
+        store.read(DATASET, period)
+    with pytest.raises(ValueError):
+        store.compact(DATASET, period)
+    with pytest.raises(ValueError):
+        store.ingest(snapshots[PERIODS[-1]][0], period=period)
+    assert store.list_periods(DATASET) == PERIODS
@@ -1,10 +1,14 @@
+import os
 import re
 import sys
 import math
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 from functools import wraps
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from business_calendar import get_last_weekdays, get_month_weekdays  # noqa: E402
+
 
 def get_month(delta_month: int = 0, digit: int = 2) -> str:
     """
@@ -53,11 +57,10 @@ def get_last_weekday(delta: int = -1, date_format: str = "%Y-%m-%d"):
         f"delta '{delta}' is not acceptable by function get_last_weekday. "
         + "Please use values between 0 & -6"
     )
-    while True:
-        _date = datetime.today() + timedelta(delta)
-        if _date.weekday() < 5:
-            return _date.strftime(date_format)
-        delta -= 1
+    # keep the time of today for date formats with time fields
+    today = datetime.today()
+    _date = get_last_weekdays(delta, today=today, date_format=None).item()
+    return datetime.combine(_date, today.time()).strftime(date_format)
 
 
 def get_month_weekday(delta_working_days: int = 0, date_format: str = "%Y-%m-%d"):
@@ -71,19 +74,14 @@ def get_month_weekday(delta_working_days: int = 0, date_format: str = "%Y-%m-%d"
     Return:
         - date (str): string date in the given date format
     """
-    days = 0
-    _working_days = 0
     assert delta_working_days >= 0, (
         f"delta '{delta_working_days}' is not acceptable by function get_month_weekday. "
         + "Please use values higher then 0"
     )
-    while True:
-        _date = datetime.today().replace(day=1) + timedelta(days)
-        if _date.weekday() < 5:
-            _working_days += 1
-        if _working_days >= delta_working_days:
-            return _date.strftime(date_format)
-        days += 1
+    # keep the time of today for date formats with time fields
+    today = datetime.today()
+    _date = get_month_weekdays(delta_working_days, today=today, date_format=None).item()
+    return datetime.combine(_date, today.time()).strftime(date_format)
 
 
 def timing(func):